@@ -8,7 +8,10 @@ and ready for direct AWS Lambda deployment.
 Usage:
     python build_lambda.py agent-alpha [1.0.0]
     python build_lambda.py agent-beta [2.1.0]
+    python build_lambda.py agent-beta 2.1.0 --max-size-mb 20 --report size.json
 """
+import argparse
+import json
 import os
 import sys
 import shutil
@@ -16,25 +19,60 @@ import subprocess
 import tempfile
 import zipfile
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+# AWS Lambda limits for direct .zip upload and unpacked deployment size
+DEFAULT_MAX_SIZE_MB = 50.0
+DEFAULT_MAX_UNZIPPED_MB = 250.0
+
+# Files not needed at runtime, grouped by report category. Python modules are
+# only stripped from test directories; doc directories may hold runtime code
+# (e.g. botocore.docs), so only their non-.py files are stripped.
+TEST_DIRS = {"tests", "test"}
+DOC_DIRS = {"docs", "doc", "examples"}
+DOC_SUFFIXES = {".md", ".rst"}
+STUB_SUFFIXES = {".pyi"}
+DEV_SUFFIXES = {".c", ".h", ".cpp", ".pyx", ".pxd"}
+# License and notice files must ship with redistributed dependencies
+KEEP_FILE_PREFIXES = ("LICENSE", "LICENCE", "NOTICE", "COPYING")
+
+MB = 1024 * 1024
 
 
 class LambdaPackageBuilder:
     """Build AWS Lambda deployment packages for Strands agents."""
     
-    def __init__(self, workspace_root: Path, agent_name: str, version: Optional[str] = None):
+    def __init__(
+        self,
+        workspace_root: Path,
+        agent_name: str,
+        version: Optional[str] = None,
+        max_size_mb: Optional[float] = DEFAULT_MAX_SIZE_MB,
+        max_unzipped_mb: Optional[float] = DEFAULT_MAX_UNZIPPED_MB,
+        report_path: Optional[Path] = None,
+        strip_dev_files: bool = True,
+    ):
         """Initialize builder.
         
         Args:
             workspace_root: Root of monorepo.
             agent_name: Agent package name (agent-alpha or agent-beta).
             version: Semantic version tag (e.g., 1.0.0). Uses workspace version if None.
+            max_size_mb: Compressed size budget in MB. None disables the check.
+            max_unzipped_mb: Uncompressed size budget in MB. None disables the check.
+            report_path: Optional path to write the JSON size report.
+            strip_dev_files: Remove test, doc, type-stub and dev files before zipping.
         """
         self.workspace_root = workspace_root
         self.agent_name = agent_name
         self.agent_dir = workspace_root / "packages" / agent_name
         self.version = version or self._get_workspace_version()
         self.artifact_name = f"{agent_name}-v{self.version}"
+        self.max_size_mb = max_size_mb
+        self.max_unzipped_mb = max_unzipped_mb
+        self.report_path = report_path
+        self.strip_dev_files = strip_dev_files
+        self.size_report: Optional[Dict[str, Any]] = None
     
     def _get_workspace_version(self) -> str:
         """Extract version from root pyproject.toml."""
@@ -74,6 +112,9 @@ class LambdaPackageBuilder:
             
         Returns:
             Path to created .zip file.
+            
+        Raises:
+            RuntimeError: If the package exceeds its size budget.
         """
         output_dir = output_dir or self.workspace_root
         zip_path = output_dir / f"{self.artifact_name}.zip"
@@ -92,11 +133,26 @@ class LambdaPackageBuilder:
             # Step 3: Clean up unnecessary files
             print("🧹 Cleaning up unnecessary files...")
             self._cleanup_unnecessary_files(staging)
+            stripped = self._strip_dev_files(staging) if self.strip_dev_files else {}
             
             # Step 4: Create zip archive
             print("🏗️  Creating Lambda deployment zip...")
             self._create_zip(staging, zip_path)
         
+        # Step 5: Report size breakdown and enforce budget
+        print("📊 Analyzing package size...")
+        self.size_report = self._build_size_report(zip_path, stripped)
+        self._print_size_report(self.size_report)
+        if self.report_path is not None:
+            self.report_path.write_text(json.dumps(self.size_report, indent=2))
+            print(f"✓ Size report written: {self.report_path}")
+        try:
+            self._enforce_budget(self.size_report)
+        except RuntimeError:
+            # Never leave an over-budget artifact behind for CI to pick up
+            zip_path.unlink(missing_ok=True)
+            raise
+        
         return zip_path
     
     def _install_dependencies(self, staging: Path) -> None:
@@ -166,6 +222,121 @@ class LambdaPackageBuilder:
         for pyo_file in staging.glob("**/*.pyo"):
             pyo_file.unlink()
     
+    def _classify_dev_file(self, rel_path: Path) -> Optional[str]:
+        """Return report category for a file not needed at runtime, else None."""
+        # Top-level files are the agent's own modules; never strip them
+        if len(rel_path.parts) < 2:
+            return None
+        if rel_path.name.upper().startswith(KEEP_FILE_PREFIXES):
+            return None
+        dirs = set(rel_path.parts[1:-1])
+        if dirs & TEST_DIRS:
+            return "test"
+        if rel_path.suffix == ".py":
+            return None
+        if dirs & DOC_DIRS or rel_path.suffix in DOC_SUFFIXES:
+            return "doc"
+        if rel_path.suffix in STUB_SUFFIXES:
+            return "type_stub"
+        if rel_path.suffix in DEV_SUFFIXES:
+            return "dev"
+        return None
+    
+    def _strip_dev_files(self, staging: Path) -> Dict[str, Dict[str, int]]:
+        """Remove test, doc, type-stub and dev files from staging.
+        
+        Returns:
+            Per-category counts of removed files and bytes.
+        """
+        stripped: Dict[str, Dict[str, int]] = {}
+        for file_path in list(staging.rglob("*")):
+            if not file_path.is_file():
+                continue
+            category = self._classify_dev_file(file_path.relative_to(staging))
+            if category is None:
+                continue
+            entry = stripped.setdefault(category, {"files": 0, "bytes": 0})
+            entry["files"] += 1
+            entry["bytes"] += file_path.stat().st_size
+            file_path.unlink()
+        
+        # Drop directories left empty by stripping
+        for dir_path in sorted(staging.rglob("*"), key=lambda p: len(p.parts), reverse=True):
+            if dir_path.is_dir() and not any(dir_path.iterdir()):
+                dir_path.rmdir()
+        
+        return stripped
+    
+    def _build_size_report(
+        self, zip_path: Path, stripped: Dict[str, Dict[str, int]]
+    ) -> Dict[str, Any]:
+        """Build per-top-level-package size breakdown from the zip archive."""
+        packages: Dict[str, Dict[str, int]] = {}
+        with zipfile.ZipFile(zip_path) as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                top = Path(info.filename).parts[0]
+                if top.endswith(".py"):
+                    top = top[:-3]
+                entry = packages.setdefault(
+                    top, {"compressed": 0, "uncompressed": 0, "files": 0}
+                )
+                entry["compressed"] += info.compress_size
+                entry["uncompressed"] += info.file_size
+                entry["files"] += 1
+        
+        ordered = dict(
+            sorted(packages.items(), key=lambda kv: kv[1]["compressed"], reverse=True)
+        )
+        return {
+            "artifact": zip_path.name,
+            "agent": self.agent_name,
+            "version": self.version,
+            "zip_bytes": zip_path.stat().st_size,
+            "compressed_bytes": sum(p["compressed"] for p in packages.values()),
+            "uncompressed_bytes": sum(p["uncompressed"] for p in packages.values()),
+            "packages": ordered,
+            "stripped": stripped,
+            "budget": {
+                "max_size_mb": self.max_size_mb,
+                "max_unzipped_mb": self.max_unzipped_mb,
+            },
+        }
+    
+    def _print_size_report(self, report: Dict[str, Any], top: int = 15) -> None:
+        """Print human-readable size breakdown."""
+        print(f"  {'package':<32} {'compressed':>12} {'uncompressed':>14} {'files':>7}")
+        for name, entry in list(report["packages"].items())[:top]:
+            print(
+                f"  {name:<32} {entry['compressed'] / MB:>9.2f} MB "
+                f"{entry['uncompressed'] / MB:>11.2f} MB {entry['files']:>7}"
+            )
+        remaining = len(report["packages"]) - top
+        if remaining > 0:
+            print(f"  ... {remaining} more")
+        for category, entry in sorted(report["stripped"].items()):
+            print(
+                f"  ✂️  stripped {entry['files']} {category} file(s) "
+                f"({entry['bytes'] / MB:.2f} MB)"
+            )
+        print(f"  uncompressed total: {report['uncompressed_bytes'] / MB:.1f} MB")
+    
+    def _enforce_budget(self, report: Dict[str, Any]) -> None:
+        """Fail the build if the package exceeds its size budget."""
+        violations: List[str] = []
+        zip_mb = report["zip_bytes"] / MB
+        unzipped_mb = report["uncompressed_bytes"] / MB
+        if self.max_size_mb is not None and zip_mb > self.max_size_mb:
+            violations.append(f"zip {zip_mb:.1f} MB > budget {self.max_size_mb:.1f} MB")
+        if self.max_unzipped_mb is not None and unzipped_mb > self.max_unzipped_mb:
+            violations.append(
+                f"unzipped {unzipped_mb:.1f} MB > budget {self.max_unzipped_mb:.1f} MB"
+            )
+        if violations:
+            raise RuntimeError(f"Size budget exceeded: {'; '.join(violations)}")
+        print("✓ Package within size budget")
+    
     def _create_zip(self, staging: Path, zip_path: Path) -> None:
         """Create zip archive from staging directory."""
         with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
@@ -178,20 +349,64 @@ class LambdaPackageBuilder:
         print(f"✓ Lambda package created: {zip_path.name} ({size_mb:.1f} MB)")
 
 
+def _budget_arg(value: Any) -> Optional[float]:
+    """Parse a size budget in MB; 0 or negative disables the check."""
+    mb = float(value)
+    return mb if mb > 0 else None
+
+
 def main():
     """CLI entry point."""
-    if len(sys.argv) < 2:
-        print("Usage: python build_lambda.py <agent-name> [version]")
-        print("  agent-name: agent-alpha or agent-beta")
-        print("  version: semantic version (optional, e.g., 1.0.0)")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Build AWS Lambda deployment package for a Strands agent."
+    )
+    parser.add_argument("agent_name", help="agent-alpha or agent-beta")
+    parser.add_argument("version", nargs="?", help="semantic version (e.g., 1.0.0)")
+    parser.add_argument(
+        "--max-size-mb",
+        type=float,
+        help="compressed size budget in MB (0 disables; env LAMBDA_MAX_SIZE_MB)",
+    )
+    parser.add_argument(
+        "--max-unzipped-mb",
+        type=float,
+        help="uncompressed size budget in MB (0 disables; env LAMBDA_MAX_UNZIPPED_MB)",
+    )
+    parser.add_argument(
+        "--no-strip",
+        action="store_true",
+        help="keep test, doc, type-stub and dev files in the package",
+    )
+    parser.add_argument(
+        "--report", type=Path, help="write machine-readable JSON size report to path"
+    )
+    args = parser.parse_args()
     
-    agent_name = sys.argv[1]
-    version = sys.argv[2] if len(sys.argv) > 2 else None
+    # Budgets not given on the command line come from the environment
+    budgets = {}
+    for name, env_var, default in (
+        ("max_size_mb", "LAMBDA_MAX_SIZE_MB", DEFAULT_MAX_SIZE_MB),
+        ("max_unzipped_mb", "LAMBDA_MAX_UNZIPPED_MB", DEFAULT_MAX_UNZIPPED_MB),
+    ):
+        value = getattr(args, name)
+        if value is None:
+            value = os.environ.get(env_var, str(default))
+        try:
+            budgets[name] = _budget_arg(value)
+        except ValueError:
+            parser.error(f"{env_var} must be a number of MB, got {value!r}")
     
     workspace_root = Path(__file__).parent
     
-    builder = LambdaPackageBuilder(workspace_root, agent_name, version)
+    builder = LambdaPackageBuilder(
+        workspace_root,
+        args.agent_name,
+        args.version,
+        max_size_mb=budgets["max_size_mb"],
+        max_unzipped_mb=budgets["max_unzipped_mb"],
+        report_path=args.report,
+        strip_dev_files=not args.no_strip,
+    )
     
     print(f"🔨 Building Lambda package: {builder.artifact_name}")
     
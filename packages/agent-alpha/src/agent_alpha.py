@@ -3,7 +3,7 @@
 This agent demonstrates basic Strands SDK integration with lib1 configuration.
 """
 from typing import Any, Dict
-from lib1 import AgentConfig, metadata
+from lib1 import AgentConfig, get_tracer, metadata
 
 
 class StrandsAgent:
@@ -27,8 +27,9 @@ class StrandsAgent:
         Returns:
             Agent response.
         """
-        meta = metadata()
-        return f"{self.name} processed: {message} (via {meta.get('library')})"
+        with get_tracer().span("StrandsAgent.invoke", agent=self.name):
+            meta = metadata()
+            return f"{self.name} processed: {message} (via {meta.get('library')})"
     
     def shutdown(self) -> None:
         """Clean shutdown of agent resources."""
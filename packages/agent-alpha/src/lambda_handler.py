@@ -8,7 +8,14 @@ from typing import Any, Dict
 import json
 import logging
 
-from lib1 import AgentConfig
+from lib1 import (
+    AgentConfig,
+    EventCapture,
+    configure_logging,
+    flush_logging,
+    get_tracer,
+    traceparent_from_event,
+)
 from agent_alpha import create_agent
 
 logger = logging.getLogger(__name__)
@@ -16,14 +23,18 @@ logger.setLevel(logging.INFO)
 
 # Cold-start initialization and configuration validation
 try:
+    configure_logging()
     _config = AgentConfig.from_env()
     _agent = create_agent(config=_config)
-    logger.info(f"Agent Alpha initialized: {_config.agent_name}")
+    logger.info("Agent Alpha initialized: %s", _config.agent_name)
 except Exception as e:
-    logger.error(f"Cold-start initialization failed: {e}")
+    logger.error("Cold-start initialization failed: %s", e)
     _config = None
     _agent = None
 
+# Opt-in replay capture; invalid settings disable capture, never the agent
+_capture = EventCapture.from_env()
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """AWS Lambda handler for Agent Alpha.
@@ -38,6 +49,18 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Raises:
         ValueError: If config validation fails at cold start.
     """
+    try:
+        with get_tracer().trace("lambda_handler", traceparent=traceparent_from_event(event)) as span:
+            response = _handle_event(event, context)
+            span.set_attribute("status_code", response["statusCode"])
+            return response
+    finally:
+        # Drain async log queue before Lambda freezes the container
+        flush_logging()
+
+
+def _handle_event(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Process a single Lambda event (see lambda_handler)."""
     # Validate cold-start initialization
     if _agent is None or _config is None:
         return {
@@ -46,6 +69,9 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "body": json.dumps({"error": "Agent initialization failed at cold start"})
         }
     
+    # Opt-in sampled capture for replay load testing (EVENT_CAPTURE_DIR)
+    _capture.record(event)
+    
     try:
         # Extract message from event
         message = event.get("message", "default message")
@@ -64,7 +90,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
     
     except Exception as e:
-        logger.exception(f"Error processing request: {e}")
+        logger.exception("Error processing request: %s", e)
         return {
             "statusCode": 500,
             "headers": {"Content-Type": "application/json"},
@@ -4,35 +4,262 @@ This agent demonstrates Strands SDK integration with HTTP client for
 posting responses to AgentCore platform. Configuration is validated at
 Lambda cold start per 12-factor principles.
 """
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
 from typing import Any, Dict, Optional
 import os
 import logging
+import threading
+import time
 
 try:
     import requests
 except ImportError:
     requests = None  # type: ignore
 
-from lib1 import AgentConfig
+from lib1 import AgentConfig, get_tracer
 
 logger = logging.getLogger(__name__)
 
 
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """Initialize token bucket.
+        
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum burst size. Defaults to max(1, rate).
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+    
+    def acquire(self, timeout: float = 0.0) -> bool:
+        """Take one token, waiting up to timeout seconds for it.
+        
+        Returns:
+            True if a token was taken.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return True
+                wait = (1.0 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+    
+    @property
+    def tokens(self) -> float:
+        """Currently available tokens."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit driven by observed latency and overload signals.
+    
+    The limit grows by roughly one per limit's worth of fast successful
+    requests and is multiplied by ``backoff`` on slow responses, 429/5xx or
+    timeouts, at most once per latency target window.
+    """
+    
+    def __init__(
+        self,
+        max_limit: int,
+        latency_target_s: float,
+        min_limit: int = 1,
+        backoff: float = 0.5,
+    ):
+        """Initialize limiter.
+        
+        Args:
+            max_limit: Upper bound (and starting value) for the concurrency limit.
+            latency_target_s: Latency above which a response counts as overload.
+            min_limit: Lower bound for the concurrency limit.
+            backoff: Multiplicative decrease factor.
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.latency_target_s = latency_target_s
+        self.backoff = backoff
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+    
+    def acquire(self, timeout: float = 0.0) -> bool:
+        """Reserve an in-flight slot, waiting up to timeout seconds.
+        
+        Returns:
+            True if a slot was reserved; the caller must then call release.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                return False
+            self.in_flight += 1
+            return True
+    
+    def release(self, latency_s: float, overloaded: bool = False) -> None:
+        """Free a slot and adapt the limit from the request outcome."""
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if overloaded or (self.latency_target_s and latency_s > self.latency_target_s):
+                if now - self._last_decrease >= self.latency_target_s:
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                    self._last_decrease = now
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+    
+    def cancel(self) -> None:
+        """Free a slot for a request that was never sent, without adapting the limit."""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+
+def _parse_retry_after(value: Optional[str]) -> float:
+    """Return Retry-After header delay in seconds (delta-seconds or HTTP-date)."""
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class EndpointLimits:
+    """Outbound limit state shared by all clients of one AgentCore endpoint.
+    
+    Holds the token bucket, AIMD concurrency limiter, ``Retry-After`` deadline
+    and outcome counters, so pooled per-tenant clients neither multiply the
+    allowed rate nor forget a 429 seen by another tenant or lose learned
+    limits when evicted.
+    """
+    
+    def __init__(self, rate_limit: float, max_concurrency: int, latency_target_ms: float):
+        """Initialize endpoint limits (see AgentCoreClient for arguments)."""
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit > 0 else None
+        self.concurrency_limiter = AdaptiveConcurrencyLimiter(
+            max_limit=max_concurrency, latency_target_s=latency_target_ms / 1000
+        )
+        self.retry_after_until = 0.0
+        self.counters = {"sent": 0, "throttled": 0, "rejected_429": 0, "errors_5xx": 0}
+        self._lock = threading.Lock()
+    
+    def count(self, key: str) -> None:
+        """Increment an outcome counter."""
+        with self._lock:
+            self.counters[key] += 1
+    
+    def block_for(self, delay: float) -> None:
+        """Shed requests to this endpoint for delay seconds (Retry-After)."""
+        with self._lock:
+            self.retry_after_until = max(self.retry_after_until, time.monotonic() + delay)
+    
+    def retry_after_remaining(self) -> float:
+        """Seconds left in the current Retry-After window."""
+        return max(0.0, self.retry_after_until - time.monotonic())
+    
+    def snapshot_counters(self) -> Dict[str, int]:
+        """Return a copy of the outcome counters."""
+        with self._lock:
+            return dict(self.counters)
+
+
+# Bound on distinct endpoints tracked; tenant overrides may name many endpoints
+_MAX_TRACKED_ENDPOINTS = 1024
+_endpoint_limits: "OrderedDict[str, EndpointLimits]" = OrderedDict()
+_endpoint_limits_lock = threading.Lock()
+
+
+def get_endpoint_limits(
+    endpoint: str,
+    rate_limit: float = 0.0,
+    max_concurrency: int = 16,
+    latency_target_ms: float = 2000.0,
+) -> EndpointLimits:
+    """Return the shared EndpointLimits for endpoint, creating it on first use.
+    
+    Settings are taken from the first client of an endpoint; they come from
+    the deployment-wide AgentConfig, which tenant overrides cannot change.
+    """
+    with _endpoint_limits_lock:
+        limits = _endpoint_limits.get(endpoint)
+        if limits is None:
+            limits = EndpointLimits(rate_limit, max_concurrency, latency_target_ms)
+            _endpoint_limits[endpoint] = limits
+            while len(_endpoint_limits) > _MAX_TRACKED_ENDPOINTS:
+                _endpoint_limits.popitem(last=False)
+        else:
+            _endpoint_limits.move_to_end(endpoint)
+        return limits
+
+
 class AgentCoreClient:
     """HTTP client for AgentCore platform integration.
     
     Posts agent responses to AgentCore endpoint with optional Bearer token auth.
+    Outbound requests are paced by a token bucket and an adaptive (AIMD)
+    concurrency limit shared by every client of the same endpoint; requests
+    over the limits, or inside a ``Retry-After`` window, are shed locally with
+    status ``throttled``.
     """
     
-    def __init__(self, endpoint: Optional[str] = None, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        endpoint: Optional[str] = None,
+        api_key: Optional[str] = None,
+        rate_limit: float = 0.0,
+        max_concurrency: int = 16,
+        latency_target_ms: float = 2000.0,
+        acquire_timeout: float = 1.0,
+    ):
         """Initialize AgentCore client.
         
         Args:
             endpoint: AgentCore HTTP endpoint. Falls back to AGENTCORE_ENDPOINT env var.
-            api_key: Bearer token for authentication. Falls back to AGENTCORE_API_KEY env var.
+            api_key: Bearer token for authentication. Falls back to AGENTCORE_API_KEY env var
+                when None; pass "" to send no token.
+            rate_limit: Max requests per second (0 disables rate limiting).
+            max_concurrency: Upper bound for adaptive in-flight request limit.
+            latency_target_ms: Latency above which concurrency is reduced.
+            acquire_timeout: Max seconds to wait for a rate or concurrency slot.
         """
         self.endpoint = endpoint or os.environ.get("AGENTCORE_ENDPOINT")
-        self.api_key = api_key or os.environ.get("AGENTCORE_API_KEY")
+        self.api_key = api_key if api_key is not None else os.environ.get("AGENTCORE_API_KEY")
+        self.acquire_timeout = acquire_timeout
+        self.endpoint_limits = get_endpoint_limits(
+            self.endpoint or "", rate_limit, max_concurrency, latency_target_ms
+        )
+        self.rate_limiter = self.endpoint_limits.rate_limiter
+        self.concurrency_limiter = self.endpoint_limits.concurrency_limiter
+        self._session = None
+    
+    def _get_session(self):
+        """Return pooled HTTP session, creating it on first use."""
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
     
     def send_event(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Send event payload to AgentCore.
@@ -46,17 +273,89 @@ class AgentCoreClient:
         if not self.endpoint or requests is None:
             return {"status": "ok", "endpoint": self.endpoint, "payload": payload}
         
-        try:
-            headers = {"Content-Type": "application/json"}
-            if self.api_key:
-                headers["Authorization"] = f"Bearer {self.api_key}"
+        tracer = get_tracer()
+        with tracer.span("AgentCoreClient.send_event", endpoint=self.endpoint) as span:
+            throttled = self._acquire()
+            if throttled:
+                span.set_attribute("throttled", throttled)
+                return {"status": "throttled", "error": throttled}
             
-            resp = requests.post(self.endpoint, json=payload, headers=headers, timeout=10)
-            resp.raise_for_status()
-            return resp.json()
-        except Exception as e:
-            logger.warning(f"AgentCore event send failed: {e}")
-            return {"status": "error", "error": str(e)}
+            start = time.monotonic()
+            overloaded = False
+            try:
+                headers = {"Content-Type": "application/json"}
+                if self.api_key:
+                    headers["Authorization"] = f"Bearer {self.api_key}"
+                traceparent = tracer.current_traceparent()
+                if traceparent:
+                    headers["traceparent"] = traceparent
+                
+                self.endpoint_limits.count("sent")
+                resp = self._get_session().post(
+                    self.endpoint, json=payload, headers=headers, timeout=10
+                )
+                span.set_attribute("status_code", resp.status_code)
+                if resp.status_code == 429 or resp.status_code >= 500:
+                    overloaded = True
+                    self._record_overload(resp)
+                resp.raise_for_status()
+                return resp.json()
+            except Exception as e:
+                if isinstance(e, requests.Timeout):
+                    overloaded = True
+                span.set_attribute("error", str(e))
+                logger.warning("AgentCore event send failed: %s", e)
+                return {"status": "error", "error": str(e)}
+            finally:
+                self.concurrency_limiter.release(time.monotonic() - start, overloaded)
+    
+    def _acquire(self) -> Optional[str]:
+        """Reserve concurrency and rate slots.
+        
+        The concurrency slot is taken first so a request shed for lack of a
+        slot never consumes a rate token.
+        
+        Returns:
+            None if the request may be sent, else the reason it was shed.
+        """
+        reason = None
+        if self.endpoint_limits.retry_after_remaining() > 0:
+            reason = "AgentCore Retry-After in effect"
+        elif not self.concurrency_limiter.acquire(self.acquire_timeout):
+            reason = "AgentCore concurrency limit exceeded"
+        elif self.rate_limiter and not self.rate_limiter.acquire(self.acquire_timeout):
+            self.concurrency_limiter.cancel()
+            reason = "AgentCore rate limit exceeded"
+        if reason:
+            self.endpoint_limits.count("throttled")
+        return reason
+    
+    def _record_overload(self, resp: Any) -> None:
+        """Count 429/5xx responses and honor their Retry-After header."""
+        self.endpoint_limits.count("rejected_429" if resp.status_code == 429 else "errors_5xx")
+        delay = _parse_retry_after(resp.headers.get("Retry-After"))
+        if delay:
+            self.endpoint_limits.block_for(delay)
+    
+    def limits(self) -> Dict[str, Any]:
+        """Return current endpoint rate/concurrency limits and outcome counters as metrics."""
+        limiter = self.concurrency_limiter
+        metrics = {
+            "rate_limit": self.rate_limiter.rate if self.rate_limiter else None,
+            "rate_tokens": self.rate_limiter.tokens if self.rate_limiter else None,
+            "concurrency_limit": int(limiter.limit),
+            "max_concurrency": limiter.max_limit,
+            "in_flight": limiter.in_flight,
+            "retry_after_s": self.endpoint_limits.retry_after_remaining(),
+        }
+        metrics.update(self.endpoint_limits.snapshot_counters())
+        return metrics
+    
+    def shutdown(self) -> None:
+        """Close pooled HTTP connections held by this client."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
 
 class StrandsAgent:
@@ -76,7 +375,11 @@ class StrandsAgent:
         self.name = config.agent_name
         self.agentcore_client = agentcore_client or AgentCoreClient(
             endpoint=config.agentcore_endpoint,
-            api_key=config.agentcore_api_key
+            # Config is authoritative; never fall back to the deployment key
+            api_key=config.agentcore_api_key or "",
+            rate_limit=config.agentcore_rate_limit,
+            max_concurrency=config.agentcore_max_concurrency,
+            latency_target_ms=config.agentcore_latency_target_ms,
         )
     
     def invoke(self, message: str) -> str:
@@ -88,9 +391,10 @@ class StrandsAgent:
         Returns:
             Agent response.
         """
-        # Placeholder for Strands strand execution
-        # In production, this invokes Strands SDK to execute defined strands/workflows
-        return f"Strands-agent {self.name} processed: {message}"
+        with get_tracer().span("StrandsAgent.invoke", agent=self.name):
+            # Placeholder for Strands strand execution
+            # In production, this invokes Strands SDK to execute defined strands/workflows
+            return f"Strands-agent {self.name} processed: {message}"
     
     def run(self, message: str = "default") -> Dict[str, Any]:
         """Execute Strands agent and post to AgentCore.
@@ -101,13 +405,14 @@ class StrandsAgent:
         Returns:
             Dict with langgraph_response and agentcore_response keys (backward compatible).
         """
-        response = self.invoke(message)
-        payload = {
-            "agent": self.name,
-            "input": message,
-            "output": response
-        }
-        ac_resp = self.agentcore_client.send_event(payload)
+        with get_tracer().span("StrandsAgent.run", agent=self.name):
+            response = self.invoke(message)
+            payload = {
+                "agent": self.name,
+                "input": message,
+                "output": response
+            }
+            ac_resp = self.agentcore_client.send_event(payload)
         return {
             "langgraph_response": response,  # Keep key name for backward compat
             "agentcore_response": ac_resp
@@ -115,7 +420,7 @@ class StrandsAgent:
     
     def shutdown(self) -> None:
         """Clean shutdown of agent resources."""
-        pass
+        self.agentcore_client.shutdown()
 
 
 def create_agent_components(config: AgentConfig | None = None) -> Dict[str, Any]:
@@ -162,6 +467,91 @@ def shutdown(components: Dict[str, Any]) -> None:
     agent.shutdown()
 
 
+class AgentPool:
+    """Bounded LRU pool of per-tenant agent components.
+    
+    Resolves per-event config overrides against a base AgentConfig and caches
+    the resulting AgentConfig, StrandsAgent and AgentCoreClient per tenant so
+    warm Lambda containers can serve many tenants without constructing clients
+    per request. Least recently used tenants are evicted and shut down once
+    the pool exceeds max_size.
+    """
+    
+    def __init__(self, base_config: AgentConfig, max_size: Optional[int] = None):
+        """Initialize agent pool.
+        
+        Args:
+            base_config: AgentConfig that per-tenant overrides are applied to.
+            max_size: Maximum cached tenants. Defaults to base_config.agent_pool_size.
+        """
+        self.base_config = base_config
+        self.max_size = max_size or base_config.agent_pool_size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    def get(self, tenant_id: str, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Return cached components for a tenant, creating them on miss.
+        
+        A cached entry whose config no longer matches the requested overrides
+        is shut down and rebuilt.
+        
+        Args:
+            tenant_id: Tenant key for the pool.
+            overrides: Optional AgentConfig field overrides for this tenant.
+            
+        Returns:
+            Dict with agent, agentcore and config keys (see create_agent_components).
+            
+        Raises:
+            ValueError: If overrides are invalid.
+        """
+        config = self.base_config.with_overrides(overrides or {})
+        stale = []
+        with self._lock:
+            components = self._entries.get(tenant_id)
+            if components is not None and components["config"] == config:
+                self._entries.move_to_end(tenant_id)
+                self._hits += 1
+                return components
+            
+            self._misses += 1
+            if components is not None:
+                stale.append(self._entries.pop(tenant_id))
+            components = create_agent_components(config=config)
+            self._entries[tenant_id] = components
+            while len(self._entries) > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._evictions += 1
+                stale.append(evicted)
+        
+        # Release connections outside the lock
+        for old in stale:
+            shutdown(old)
+        return components
+    
+    def stats(self) -> Dict[str, int]:
+        """Return pool instance statistics."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+    
+    def shutdown(self) -> None:
+        """Shutdown and drop all cached tenant components."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for components in entries:
+            shutdown(components)
+
+
 if __name__ == "__main__":
     comps = create_agent_components()
     print(run_once(comps, "hello"))
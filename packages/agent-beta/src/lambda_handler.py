@@ -8,28 +8,44 @@ from typing import Any, Dict
 import json
 import logging
 
-from lib1 import AgentConfig
-from agent_beta import create_agent_components, run_once
+from lib1 import (
+    AgentConfig,
+    EventCapture,
+    configure_logging,
+    flush_logging,
+    get_tracer,
+    traceparent_from_event,
+)
+from agent_beta import AgentPool, create_agent_components, run_once
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 # Cold-start initialization and configuration validation
 try:
+    configure_logging()
     _config = AgentConfig.from_env()
     _components = create_agent_components(config=_config)
-    logger.info(f"Agent Beta initialized: {_config.agent_name}")
+    _pool = AgentPool(base_config=_config)
+    logger.info("Agent Beta initialized: %s", _config.agent_name)
 except Exception as e:
-    logger.error(f"Cold-start initialization failed: {e}")
+    logger.error("Cold-start initialization failed: %s", e)
     _config = None
     _components = None
+    _pool = None
+
+# Opt-in replay capture; invalid settings disable capture, never the agent
+_capture = EventCapture.from_env()
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """AWS Lambda handler for Agent Beta.
     
     Args:
-        event: Lambda event containing agent input and AgentCore endpoint.
+        event: Lambda event containing agent input. Optional ``tenant_id`` and
+            ``config`` (AgentConfig field overrides) route the request through
+            the per-tenant agent pool. A W3C ``traceparent`` (top level or in
+            ``headers``) continues an upstream trace.
         context: Lambda context object.
         
     Returns:
@@ -38,26 +54,47 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Raises:
         ValueError: If config validation fails at cold start.
     """
+    try:
+        with get_tracer().trace("lambda_handler", traceparent=traceparent_from_event(event)) as span:
+            response = _handle_event(event, context)
+            span.set_attribute("status_code", response["statusCode"])
+            return response
+    finally:
+        # Drain async log queue before Lambda freezes the container
+        flush_logging()
+
+
+def _handle_event(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Process a single Lambda event (see lambda_handler)."""
     # Validate cold-start initialization
-    if _components is None or _config is None:
+    if _components is None or _config is None or _pool is None:
         return {
             "statusCode": 500,
             "headers": {"Content-Type": "application/json"},
             "body": json.dumps({"error": "Agent initialization failed at cold start"})
         }
     
+    # Opt-in sampled capture for replay load testing (EVENT_CAPTURE_DIR)
+    _capture.record(event)
+    
     try:
         # Extract message from event
         message = event.get("message", "default message")
         
+        # Resolve per-tenant components (falls back to cold-start defaults)
+        components = _components
+        tenant_id = event.get("tenant_id")
+        if tenant_id is not None:
+            components = _pool.get(str(tenant_id), overrides=event.get("config"))
+        
         # Execute Strands agent and post to AgentCore
-        result = run_once(_components, message=message)
+        result = run_once(components, message=message)
         
         return {
             "statusCode": 200,
             "headers": {"Content-Type": "application/json"},
             "body": json.dumps({
-                "agent": _config.agent_name,
+                "agent": components["config"].agent_name,
                 "message": message,
                 "response": result.get("langgraph_response"),
                 "agentcore_status": result.get("agentcore_response", {}).get("status")
@@ -65,7 +102,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
     
     except Exception as e:
-        logger.exception(f"Error processing request: {e}")
+        logger.exception("Error processing request: %s", e)
         return {
             "statusCode": 500,
             "headers": {"Content-Type": "application/json"},
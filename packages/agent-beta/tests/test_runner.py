@@ -2,6 +2,39 @@ from lib1 import AgentConfig
 from agent_beta import create_agent_components, run_once, shutdown, StrandsAgent, AgentCoreClient
 
 
+class FakeResponse:
+    """Stand-in for requests.Response with configurable status and headers."""
+    
+    def __init__(self, status_code=200, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body if body is not None else {"status": "ok"}
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"{self.status_code} error")
+    
+    def json(self):
+        return self.body
+
+
+class FakeSession:
+    """Stand-in for requests.Session recording posts and returning FakeResponse."""
+    
+    def __init__(self, status_code=200, headers=None, body=None):
+        self.response = FakeResponse(status_code, headers, body)
+        self.calls = 0
+        self.headers = None
+    
+    def post(self, url, json, headers, timeout):
+        self.calls += 1
+        self.headers = headers
+        return self.response
+    
+    def close(self):
+        pass
+
+
 def test_strands_agent_invoke():
     """Test Strands agent invocation."""
     config = AgentConfig(agent_name="test-agent")
@@ -61,3 +94,186 @@ def test_agent_shutdown():
     # Should not raise exception
     shutdown(comps)
 
+
+
+def test_agent_pool_caches_per_tenant():
+    """Test agent pool reuses components and applies tenant overrides."""
+    from agent_beta import AgentPool
+    
+    pool = AgentPool(AgentConfig(agent_name="base-agent"), max_size=4)
+    first = pool.get("tenant-a", overrides={"agent_name": "tenant-a-agent"})
+    second = pool.get("tenant-a", overrides={"agent_name": "tenant-a-agent"})
+    
+    assert first is second
+    assert first["config"].agent_name == "tenant-a-agent"
+    assert pool.stats()["hits"] == 1
+    assert pool.stats()["misses"] == 1
+    
+    pool.shutdown()
+    assert pool.stats()["size"] == 0
+
+
+def test_agent_pool_endpoint_override_does_not_leak_api_key(monkeypatch):
+    """Test tenant endpoint override never sends the deployment API key."""
+    from agent_beta import AgentPool
+    
+    monkeypatch.setenv("AGENTCORE_API_KEY", "deployment-key")
+    pool = AgentPool(AgentConfig(agent_name="base-agent", agentcore_api_key="deployment-key"))
+    comps = pool.get("tenant", overrides={"agentcore_endpoint": "http://tenant.invalid"})
+    
+    assert comps["agentcore"].endpoint == "http://tenant.invalid"
+    assert not comps["agentcore"].api_key
+    pool.shutdown()
+
+def test_agent_pool_lru_eviction_shuts_down_client():
+    """Test agent pool evicts least recently used tenant and closes its client."""
+    from agent_beta import AgentPool
+    
+    pool = AgentPool(AgentConfig(agent_name="base-agent"), max_size=2)
+    comps_a = pool.get("a")
+    comps_a["agentcore"]._get_session()
+    pool.get("b")
+    pool.get("a")
+    pool.get("c")
+    
+    stats = pool.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert comps_a["agentcore"]._session is not None
+    
+    pool.get("b")
+    assert pool.stats()["evictions"] == 2
+    assert comps_a["agentcore"]._session is None
+
+
+def test_send_event_injects_traceparent():
+    """Test AgentCore POST carries W3C traceparent of the active sampled span."""
+    from lib1 import Tracer, set_tracer
+    
+    class ListExporter:
+        def export(self, span):
+            spans.append(span)
+    
+    spans = []
+    tracer = Tracer(sample_rate=1.0, exporter=ListExporter())
+    set_tracer(tracer)
+    try:
+        client = AgentCoreClient(endpoint="http://agentcore.invalid/traceparent")
+        client._session = FakeSession()
+        with tracer.trace("lambda_handler"):
+            assert client.send_event({"x": 1}) == {"status": "ok"}
+    finally:
+        set_tracer(None)
+    
+    send_span = spans[0]
+    assert send_span["name"] == "AgentCoreClient.send_event"
+    assert client._session.headers["traceparent"] == (
+        f"00-{send_span['trace_id']}-{send_span['span_id']}-01"
+    )
+
+
+def test_token_bucket_and_adaptive_limiter():
+    """Test token bucket denies past burst and AIMD limit adapts to outcomes."""
+    from agent_beta import AdaptiveConcurrencyLimiter, TokenBucket
+    
+    bucket = TokenBucket(rate=1.0)
+    assert bucket.acquire()
+    assert not bucket.acquire(timeout=0.0)
+    
+    limiter = AdaptiveConcurrencyLimiter(max_limit=8, latency_target_s=1.0)
+    assert limiter.acquire()
+    limiter.release(0.01, overloaded=True)
+    assert limiter.limit == 4.0
+    for _ in range(4):
+        assert limiter.acquire()
+    assert not limiter.acquire(timeout=0.0)
+    for _ in range(4):
+        limiter.release(0.01)
+    assert limiter.limit > 4.0
+    assert limiter.in_flight == 0
+
+
+def test_send_event_honors_retry_after():
+    """Test 429 with Retry-After sheds subsequent sends and is reported in limits."""
+    config = AgentConfig(
+        agent_name="test-agent",
+        agentcore_endpoint="http://agentcore.invalid/retry-after",
+        agentcore_max_concurrency=4,
+    )
+    client = StrandsAgent(config=config).agentcore_client
+    client._session = FakeSession(status_code=429, headers={"Retry-After": "30"})
+    
+    assert client.send_event({"x": 1})["status"] == "error"
+    assert client.send_event({"x": 2})["status"] == "throttled"
+    assert client._session.calls == 1
+    
+    limits = client.limits()
+    assert limits["rejected_429"] == 1
+    assert limits["throttled"] == 1
+    assert limits["concurrency_limit"] == 2
+    assert limits["max_concurrency"] == 4
+    assert 0 < limits["retry_after_s"] <= 30
+
+
+def test_send_event_honors_http_date_retry_after():
+    """Test Retry-After given as an HTTP-date blocks sends until that time."""
+    from email.utils import formatdate
+    import time
+    
+    client = AgentCoreClient(endpoint="http://agentcore.invalid/http-date", api_key="")
+    client._session = FakeSession(
+        status_code=503, headers={"Retry-After": formatdate(time.time() + 60, usegmt=True)}
+    )
+    
+    assert client.send_event({"x": 1})["status"] == "error"
+    assert client.send_event({"x": 2})["status"] == "throttled"
+    limits = client.limits()
+    assert limits["errors_5xx"] == 1
+    assert 50 < limits["retry_after_s"] <= 60
+
+
+def test_send_event_concurrency_rejection_keeps_rate_token():
+    """Test a request shed by the concurrency limit does not consume a rate token."""
+    client = AgentCoreClient(
+        endpoint="http://agentcore.invalid/concurrency",
+        api_key="",
+        rate_limit=1.0,
+        max_concurrency=1,
+        acquire_timeout=0.0,
+    )
+    client._session = FakeSession()
+    assert client.concurrency_limiter.acquire()
+    
+    result = client.send_event({"x": 1})
+    assert result["status"] == "throttled"
+    assert "concurrency" in result["error"]
+    assert client._session.calls == 0
+    assert client.rate_limiter.tokens >= 1.0
+    
+    client.concurrency_limiter.cancel()
+    assert client.send_event({"x": 2}) == {"status": "ok"}
+    assert client.limits()["in_flight"] == 0
+
+
+def test_pooled_tenants_share_endpoint_limits():
+    """Test a 429 seen by one pooled tenant throttles another tenant on the same endpoint."""
+    from agent_beta import AgentPool
+    
+    endpoint = "http://agentcore.invalid/shared"
+    pool = AgentPool(AgentConfig(agent_name="base-agent", agentcore_endpoint=endpoint))
+    tenant_a = pool.get("a", overrides={"agent_name": "tenant-a"})["agentcore"]
+    tenant_b = pool.get("b", overrides={"agent_name": "tenant-b"})["agentcore"]
+    tenant_a._session = FakeSession(status_code=429, headers={"Retry-After": "30"})
+    tenant_b._session = FakeSession()
+    
+    assert tenant_a.endpoint_limits is tenant_b.endpoint_limits
+    assert tenant_a.send_event({"x": 1})["status"] == "error"
+    assert tenant_b.send_event({"x": 2})["status"] == "throttled"
+    assert tenant_b._session.calls == 0
+    assert tenant_b.limits()["rejected_429"] == 1
+    
+    # Eviction or rebuild does not reset the learned state
+    pool.shutdown()
+    rebuilt = pool.get("b", overrides={"agent_name": "tenant-b"})["agentcore"]
+    assert rebuilt.limits()["retry_after_s"] > 0
+    pool.shutdown()
@@ -3,9 +3,23 @@
 This module provides reusable config models and helpers for agents
 deployed to AWS Lambda with environment-driven configuration.
 """
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Tuple
 from pydantic import BaseModel, Field, field_validator
+import contextvars
+import gzip
+import json
+import logging
+import logging.handlers
 import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 
 def metadata() -> Dict[str, str]:
@@ -13,6 +27,10 @@ def metadata() -> Dict[str, str]:
     return {"library": "lib1", "version": "0.0.0"}
 
 
+# AgentConfig fields that per-event (per-tenant) overrides may change
+OVERRIDABLE_FIELDS = ("agent_name", "agentcore_endpoint", "agentcore_api_key")
+
+
 class AgentConfig(BaseModel):
     """12-factor configuration for Strands-based agents.
     
@@ -30,6 +48,22 @@ class AgentConfig(BaseModel):
         default_factory=lambda: os.environ.get("AGENTCORE_API_KEY"),
         description="AgentCore Bearer token for API authentication"
     )
+    agent_pool_size: int = Field(
+        default_factory=lambda: int(os.environ.get("AGENT_POOL_SIZE", "32")),
+        description="Maximum number of per-tenant agent instances kept warm"
+    )
+    agentcore_rate_limit: float = Field(
+        default_factory=lambda: float(os.environ.get("AGENTCORE_RATE_LIMIT", "0")),
+        description="Max AgentCore requests per second per client (0 disables)"
+    )
+    agentcore_max_concurrency: int = Field(
+        default_factory=lambda: int(os.environ.get("AGENTCORE_MAX_CONCURRENCY", "16")),
+        description="Upper bound for adaptive AgentCore request concurrency"
+    )
+    agentcore_latency_target_ms: float = Field(
+        default_factory=lambda: float(os.environ.get("AGENTCORE_LATENCY_TARGET_MS", "2000")),
+        description="AgentCore latency above which concurrency is reduced"
+    )
     
     @field_validator("agent_name")
     @classmethod
@@ -39,16 +73,731 @@ class AgentConfig(BaseModel):
             raise ValueError("agent_name cannot be empty")
         return v.strip()
     
+    @field_validator("agent_pool_size")
+    @classmethod
+    def validate_agent_pool_size(cls, v: int) -> int:
+        """Ensure agent pool holds at least one instance."""
+        if v < 1:
+            raise ValueError("agent_pool_size must be at least 1")
+        return v
+    
+    @field_validator("agentcore_rate_limit", "agentcore_latency_target_ms")
+    @classmethod
+    def validate_non_negative(cls, v: float) -> float:
+        """Ensure AgentCore limit settings are not negative."""
+        if v < 0:
+            raise ValueError("AgentCore limit settings cannot be negative")
+        return v
+    
+    @field_validator("agentcore_max_concurrency")
+    @classmethod
+    def validate_agentcore_max_concurrency(cls, v: int) -> int:
+        """Ensure at least one AgentCore request may be in flight."""
+        if v < 1:
+            raise ValueError("agentcore_max_concurrency must be at least 1")
+        return v
+    
     @classmethod
     def from_env(cls) -> "AgentConfig":
         """Load configuration from environment variables (12-factor)."""
         return cls()
     
+    def with_overrides(self, overrides: Dict[str, Any]) -> "AgentConfig":
+        """Return a validated copy of this config with per-event overrides applied.
+        
+        Only OVERRIDABLE_FIELDS may be overridden. Overriding the endpoint
+        without an api key clears the key, so the deployment's credentials are
+        never sent to an endpoint named by the event.
+        
+        Args:
+            overrides: Field name to value mapping (e.g. agent_name, agentcore_endpoint).
+            
+        Returns:
+            New AgentConfig instance; this instance is left unchanged.
+            
+        Raises:
+            ValueError: If an override names a non-overridable field or fails validation.
+        """
+        rejected = set(overrides) - set(OVERRIDABLE_FIELDS)
+        if rejected:
+            raise ValueError(f"Config field(s) not overridable: {', '.join(sorted(rejected))}")
+        merged = {**self.model_dump(), **overrides}
+        if "agentcore_endpoint" in overrides and "agentcore_api_key" not in overrides:
+            merged["agentcore_api_key"] = None
+        return type(self)(**merged)
+    
     def model_dump_env(self) -> Dict[str, Optional[str]]:
         """Export config as environment variable dict for subprocess execution."""
         return {
             "AGENT_NAME": self.agent_name,
             "AGENTCORE_ENDPOINT": self.agentcore_endpoint or "",
             "AGENTCORE_API_KEY": self.agentcore_api_key or "",
+            "AGENT_POOL_SIZE": str(self.agent_pool_size),
+            "AGENTCORE_RATE_LIMIT": str(self.agentcore_rate_limit),
+            "AGENTCORE_MAX_CONCURRENCY": str(self.agentcore_max_concurrency),
+            "AGENTCORE_LATENCY_TARGET_MS": str(self.agentcore_latency_target_ms),
+        }
+
+
+
+REDACTED = "***REDACTED***"
+_SECRET_KEY_PATTERN = re.compile(
+    r"(api[_-]?key|secret|password|authorization|(^|_)token$)", re.I
+)
+
+
+def redact_secrets(value: Any, secrets: Iterable[str] = ()) -> Any:
+    """Return a copy of value with secret-looking keys and known secret values masked.
+    
+    Args:
+        value: JSON-compatible structure (dict, list or scalar).
+        secrets: Literal secret values (e.g. AGENTCORE_API_KEY) to mask wherever found.
+        
+    Returns:
+        Redacted copy of value.
+    """
+    secrets = [s for s in secrets if s]
+    
+    def _redact(v: Any) -> Any:
+        if isinstance(v, dict):
+            return {
+                k: REDACTED if _SECRET_KEY_PATTERN.search(str(k)) else _redact(item)
+                for k, item in v.items()
+            }
+        if isinstance(v, (list, tuple)):
+            return [_redact(item) for item in v]
+        if isinstance(v, str):
+            for secret in secrets:
+                v = v.replace(secret, REDACTED)
+        return v
+    
+    return _redact(value)
+
+
+class EventCapture:
+    """Opt-in sampled capture of Lambda events for later replay.
+    
+    Events are redacted and appended as JSON lines to gzip files under
+    ``directory``, rotating to a new file once ``max_bytes`` of uncompressed
+    data has been written. Each event is written as a complete gzip member,
+    so files stay readable even if the container is frozen or killed without
+    close(). Capture errors are logged and never propagate.
+    """
+    
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        sample_rate: float = 1.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        secrets: Iterable[str] = (),
+    ):
+        """Initialize event capture.
+        
+        Args:
+            directory: Output directory. Capture is disabled when None.
+            sample_rate: Fraction of events to capture (0.0-1.0).
+            max_bytes: Uncompressed bytes per file before rotating.
+            secrets: Literal secret values to redact from captured events.
+        """
+        self.directory = Path(directory) if directory else None
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.secrets = [s for s in secrets if s]
+        self._file: Optional[BinaryIO] = None
+        self._written = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_env(cls) -> "EventCapture":
+        """Load capture settings from EVENT_CAPTURE_* environment variables.
+        
+        Invalid settings log a warning and disable capture instead of raising,
+        so a debug option can never fail agent cold start.
+        """
+        try:
+            return cls(
+                directory=os.environ.get("EVENT_CAPTURE_DIR"),
+                sample_rate=float(os.environ.get("EVENT_CAPTURE_SAMPLE_RATE", "1.0")),
+                max_bytes=int(os.environ.get("EVENT_CAPTURE_MAX_BYTES", str(10 * 1024 * 1024))),
+                secrets=[os.environ.get("AGENTCORE_API_KEY", "")],
+            )
+        except ValueError as e:
+            logger.warning("Invalid event capture settings, capture disabled: %s", e)
+            return cls()
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether capture is configured."""
+        return self.directory is not None and self.sample_rate > 0
+    
+    def record(self, event: Dict[str, Any]) -> bool:
+        """Capture event if enabled and sampled.
+        
+        Args:
+            event: Lambda event to capture.
+            
+        Returns:
+            True if the event was written.
+        """
+        if not self.enabled or random.random() >= self.sample_rate:
+            return False
+        try:
+            line = json.dumps(
+                {"ts": time.time(), "event": redact_secrets(event, self.secrets)},
+                default=str,
+            ).encode() + b"\n"
+            with self._lock:
+                if self._file is None or self._written >= self.max_bytes:
+                    self._rotate()
+                # One complete gzip member per event, flushed so frozen or
+                # killed Lambda containers leave a readable file
+                self._file.write(gzip.compress(line))
+                self._file.flush()
+                self._written += len(line)
+            return True
+        except Exception as e:
+            logger.warning("Event capture failed: %s", e)
+            return False
+    
+    def _rotate(self) -> None:
+        """Close current file and open the next one."""
+        if self._file is not None:
+            self._file.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._seq += 1
+        name = f"events-{os.getpid()}-{int(time.time() * 1000)}-{self._seq:04d}.jsonl.gz"
+        self._file = open(self.directory / name, "ab")
+        self._written = 0
+    
+    def close(self) -> None:
+        """Close the current capture file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def iter_captured_events(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield captured events from a capture file or directory.
+    
+    Args:
+        path: A ``.jsonl.gz`` capture file or a directory of them.
+        
+    Yields:
+        Captured Lambda event dicts, in file order. A truncated trailing
+        record (e.g. from a writer killed mid-write) is skipped with a warning.
+    """
+    root = Path(path)
+    files = sorted(root.glob("*.jsonl.gz")) if root.is_dir() else [root]
+    for file_path in files:
+        with gzip.open(file_path, "rt") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)["event"]
+            except (EOFError, gzip.BadGzipFile, json.JSONDecodeError) as e:
+                logger.warning("Truncated capture file %s: %s", file_path, e)
+
+
+_TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class FileSpanExporter:
+    """Span exporter writing one JSON object per line to a file or stdout."""
+    
+    def __init__(self, path: Optional[str] = None):
+        """Initialize exporter.
+        
+        Args:
+            path: Output file path (appended to). Writes to stdout when None.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def export(self, span: Dict[str, Any]) -> None:
+        """Write finished span record."""
+        line = json.dumps(span, default=str) + "\n"
+        with self._lock:
+            if self.path is None:
+                sys.stdout.write(line)
+                sys.stdout.flush()
+            else:
+                with open(self.path, "a") as f:
+                    f.write(line)
+
+
+class Span:
+    """Sampled tracing span; use as a context manager via Tracer."""
+    
+    sampled = True
+    
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        attributes: Dict[str, Any],
+    ):
+        """Initialize span (not started until entered)."""
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self._token = None
+    
+    @property
+    def traceparent(self) -> str:
+        """W3C traceparent header value for this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach attribute to span."""
+        self.attributes[key] = value
+    
+    def __enter__(self) -> "Span":
+        self._start = time.time()
+        self._perf_start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration_ms = (time.perf_counter() - self._perf_start) * 1000
+        _current_span.reset(self._token)
+        record = {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self._start,
+            "duration_ms": duration_ms,
+            "status": "error" if exc_type else "ok",
+            "attributes": self.attributes,
         }
+        if exc_type:
+            record["error"] = f"{exc_type.__name__}: {exc}"
+        try:
+            self.tracer.exporter.export(record)
+        except Exception as e:
+            logger.warning("Span export failed: %s", e)
+        return False
+
+
+class _NoopSpan:
+    """Shared do-nothing span returned when a request is not sampled."""
+    
+    traceparent = None
+    
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+    
+    def __enter__(self) -> "_NoopSpan":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+class _UnsampledContext(_NoopSpan):
+    """Incoming unsampled trace context, forwarded downstream but never exported.
+    
+    Per W3C trace context, a request that does not record spans still passes
+    the caller's trace-id and parent-id on with the sampled flag cleared.
+    """
+    
+    sampled = False
+    
+    def __init__(self, trace_id: str, parent_id: str):
+        self.traceparent = f"00-{trace_id}-{parent_id}-00"
+        self._token = None
+    
+    def __enter__(self) -> "_UnsampledContext":
+        self._token = _current_span.set(self)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _current_span.reset(self._token)
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: contextvars.ContextVar[Optional[Any]] = contextvars.ContextVar(
+    "lib1_current_span", default=None
+)
+
+
+class Tracer:
+    """Head-sampled tracer with W3C trace context propagation.
+    
+    The sampling decision is made once per request by ``trace`` (or inherited
+    from an incoming ``traceparent``); ``span`` only records when a sampled
+    span is active, so unsampled requests cost a context variable lookup.
+    """
+    
+    def __init__(self, sample_rate: float = 0.0, exporter: Optional[Any] = None):
+        """Initialize tracer.
+        
+        Args:
+            sample_rate: Fraction of root traces to sample (0.0-1.0).
+            exporter: Object with ``export(span_dict)``. Defaults to stdout.
+        """
+        self.sample_rate = sample_rate
+        self.exporter = exporter or FileSpanExporter()
+    
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """Load tracer from TRACE_SAMPLE_RATE and TRACE_EXPORTER (stdout or file path).
+        
+        An invalid sample rate logs a warning and disables sampling, so tracing
+        settings can never fail a request.
+        """
+        target = os.environ.get("TRACE_EXPORTER", "stdout")
+        try:
+            sample_rate = float(os.environ.get("TRACE_SAMPLE_RATE", "0"))
+        except ValueError as e:
+            logger.warning("Invalid TRACE_SAMPLE_RATE, tracing disabled: %s", e)
+            sample_rate = 0.0
+        return cls(
+            sample_rate=sample_rate,
+            exporter=FileSpanExporter(None if target == "stdout" else target),
+        )
+    
+    def trace(self, name: str, traceparent: Optional[str] = None, **attributes: Any):
+        """Start a root span, honoring an incoming W3C traceparent if valid.
+        
+        Args:
+            name: Span name.
+            traceparent: Incoming ``traceparent`` header value, if any.
+            **attributes: Span attributes.
+            
+        Returns:
+            Context manager yielding a Span, or a no-op span when unsampled.
+            An unsampled incoming traceparent is still forwarded by
+            current_traceparent.
+        """
+        match = _TRACEPARENT_PATTERN.match(traceparent) if isinstance(traceparent, str) else None
+        if match:
+            if not int(match.group(3), 16) & 1:
+                return _UnsampledContext(match.group(1), match.group(2))
+            return Span(self, name, match.group(1), match.group(2), attributes)
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return _NOOP_SPAN
+        return Span(self, name, f"{random.getrandbits(128):032x}", None, attributes)
+    
+    def span(self, name: str, **attributes: Any):
+        """Start a child span of the active sampled span, else a no-op span."""
+        parent = _current_span.get()
+        if parent is None or not parent.sampled:
+            return _NOOP_SPAN
+        return Span(self, name, parent.trace_id, parent.span_id, attributes)
+    
+    def current_traceparent(self) -> Optional[str]:
+        """Return traceparent header for the active span or forwarded context, if any."""
+        parent = _current_span.get()
+        return parent.traceparent if parent is not None else None
+
+
+def traceparent_from_event(event: Any) -> Optional[str]:
+    """Return W3C traceparent from a Lambda event or its HTTP headers, if present.
+    
+    Malformed events yield None rather than raising, so tracing can never
+    fail a request.
+    """
+    if not isinstance(event, dict):
+        return None
+    candidates = [event.get("traceparent")]
+    headers = event.get("headers")
+    if isinstance(headers, dict):
+        candidates += [headers.get("traceparent"), headers.get("Traceparent")]
+    for value in candidates:
+        if isinstance(value, str) and value:
+            return value
+    return None
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Return process-wide tracer, loading it from the environment on first use."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer.from_env()
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Replace process-wide tracer (None reloads from environment on next use)."""
+    global _tracer
+    _tracer = tracer
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Compact single-line JSON log formatter."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        """Format record as a JSON object string."""
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class LogSampler(logging.Filter):
+    """Per-level sampling and token-bucket rate limiting for log records.
+    
+    Runs in the calling thread before records are queued, so dropped records
+    cost a dict lookup and a random draw. Drop counts are kept per level and
+    reported by flush_logging.
+    """
+    
+    def __init__(
+        self,
+        sample_rates: Optional[Dict[int, float]] = None,
+        rate_limit: float = 0.0,
+    ):
+        """Initialize sampler.
+        
+        Args:
+            sample_rates: Level number to fraction of records kept (default 1.0).
+            rate_limit: Max records per second per level (burst of the same size).
+                0 disables rate limiting.
+        """
+        super().__init__()
+        self.sample_rates = sample_rates or {}
+        self.rate_limit = rate_limit
+        self.dropped: Dict[str, int] = {}
+        self._buckets: Dict[int, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return True if record should be emitted."""
+        rate = self.sample_rates.get(record.levelno, 1.0)
+        keep = rate >= 1.0 or random.random() < rate
+        if keep and self.rate_limit <= 0:
+            return True
+        with self._lock:
+            if keep and self.rate_limit > 0:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(record.levelno, (self.rate_limit, now))
+                tokens = min(self.rate_limit, tokens + (now - last) * self.rate_limit)
+                keep = tokens >= 1.0
+                self._buckets[record.levelno] = (tokens - 1.0 if keep else tokens, now)
+            if not keep:
+                self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+        return keep
+    
+    def take_dropped(self) -> Dict[str, int]:
+        """Return and reset per-level drop counts."""
+        with self._lock:
+            dropped, self.dropped = self.dropped, {}
+        return dropped
+
+
+# Log argument types safe to format later on the writer thread
+_IMMUTABLE_LOG_ARGS = (str, bytes, int, float, bool, type(None), BaseException)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the writer thread.
+    
+    Formatting is deferred only when every argument is an immutable scalar
+    (or exception); records with other arguments, such as a payload dict that
+    the caller may mutate after logging, are rendered in the calling thread.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        # A lone mapping argument becomes record.args itself and is mutable
+        if args and (
+            isinstance(args, dict)
+            or not all(isinstance(arg, _IMMUTABLE_LOG_ARGS) for arg in args)
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class _FlushMarker:
+    """Queue item signalling that all earlier records have been written."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class _LogWriter(logging.handlers.QueueListener):
+    """Background writer thread that acknowledges flush markers."""
+    
+    def handle(self, record: Any) -> None:
+        if isinstance(record, _FlushMarker):
+            for handler in self.handlers:
+                handler.flush()
+            record.done.set()
+            return
+        super().handle(record)
+
+
+def _parse_level(name: str) -> int:
+    """Return level number for a standard level name.
+    
+    Raises:
+        ValueError: If the name is not a known logging level.
+    """
+    levels = logging.getLevelNamesMapping()
+    key = name.strip().upper()
+    if key not in levels:
+        raise ValueError(f"Unknown log level: {name!r}")
+    return levels[key]
+
+
+def _parse_sample_rates(spec: str) -> Dict[int, float]:
+    """Parse ``DEBUG=0.1,INFO=0.5`` into a level number to rate mapping.
+    
+    Raises:
+        ValueError: On unknown level names or rates outside 0.0-1.0.
+    """
+    rates: Dict[int, float] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        rate = float(value)
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Log sample rate out of range: {item!r}")
+        rates[_parse_level(name)] = rate
+    return rates
+
+
+# Seconds between "dropped log records" summaries, so they cannot storm either
+_DROP_REPORT_INTERVAL = 10.0
+_log_state: Optional[Dict[str, Any]] = None
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    sample_rates: Optional[Dict[int, float]] = None,
+    rate_limit: Optional[float] = None,
+    stream: Optional[Any] = None,
+) -> LogSampler:
+    """Route root logging through a queue to a background JSON writer thread.
+    
+    Replaces existing root handlers (e.g. the Lambda runtime handler); they
+    are restored by shutdown_logging. Defaults come from LOG_LEVEL,
+    LOG_SAMPLE_RATES (``DEBUG=0.1,INFO=1``) and LOG_RATE_LIMIT (records/s per
+    level, 0 disables); invalid environment values log a warning and fall
+    back to the defaults (INFO, no sampling, no rate limit).
+    
+    Args:
+        level: Root log level name.
+        sample_rates: Level number to fraction of records kept.
+        rate_limit: Max records per second per level.
+        stream: Output stream for the writer. Defaults to stdout.
+        
+    Returns:
+        The LogSampler filter installed on the queue handler.
+        
+    Raises:
+        ValueError: If an explicit level name is unknown.
+    """
+    global _log_state
+    shutdown_logging()
+    
+    invalid = []
+    if level is not None:
+        level_no = _parse_level(level)
+    else:
+        try:
+            level_no = _parse_level(os.environ.get("LOG_LEVEL", "INFO"))
+        except ValueError as e:
+            invalid.append(f"LOG_LEVEL: {e}")
+            level_no = logging.INFO
+    if sample_rates is None:
+        try:
+            sample_rates = _parse_sample_rates(os.environ.get("LOG_SAMPLE_RATES", ""))
+        except ValueError as e:
+            invalid.append(f"LOG_SAMPLE_RATES: {e}")
+            sample_rates = {}
+    if rate_limit is None:
+        try:
+            rate_limit = max(0.0, float(os.environ.get("LOG_RATE_LIMIT", "0")))
+        except ValueError as e:
+            invalid.append(f"LOG_RATE_LIMIT: {e}")
+            rate_limit = 0.0
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    sampler = LogSampler(sample_rates=sample_rates, rate_limit=rate_limit)
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(sampler)
+    
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(JsonLogFormatter())
+    listener = _LogWriter(log_queue, writer)
+    
+    root = logging.getLogger()
+    _log_state = {
+        "queue": log_queue,
+        "listener": listener,
+        "sampler": sampler,
+        "queue_handler": queue_handler,
+        "previous_handlers": root.handlers[:],
+        "previous_level": root.level,
+        "last_drop_report": time.monotonic(),
+    }
+    root.handlers = [queue_handler]
+    root.setLevel(level_no)
+    listener.start()
+    for message in invalid:
+        logger.warning("Invalid logging setting, using default: %s", message)
+    return sampler
+
+
+def _report_dropped(force: bool = False) -> None:
+    """Queue a summary of sampled-out records, at most once per report interval."""
+    now = time.monotonic()
+    if not force and now - _log_state["last_drop_report"] < _DROP_REPORT_INTERVAL:
+        return
+    dropped = _log_state["sampler"].take_dropped()
+    if not dropped:
+        return
+    _log_state["last_drop_report"] = now
+    summary = ", ".join(f"{name}={count}" for name, count in sorted(dropped.items()))
+    _log_state["queue"].put(logging.LogRecord(
+        __name__, logging.WARNING, __file__, 0,
+        "Dropped log records (sampling/rate limit): %s", (summary,), None,
+    ))
+
+
+def flush_logging(timeout: float = 1.0) -> bool:
+    """Block until queued log records are written.
+    
+    Args:
+        timeout: Maximum seconds to wait for the writer thread.
+        
+    Returns:
+        True if the queue drained within timeout (or logging is not configured).
+    """
+    if _log_state is None:
+        return True
+    _report_dropped()
+    marker = _FlushMarker()
+    _log_state["queue"].put(marker)
+    return marker.done.wait(timeout)
+
 
+def shutdown_logging() -> None:
+    """Drain and stop the background writer and restore previous root handlers."""
+    global _log_state
+    if _log_state is None:
+        return
+    _report_dropped(force=True)
+    _log_state["listener"].stop()
+    root = logging.getLogger()
+    root.handlers = _log_state["previous_handlers"]
+    root.setLevel(_log_state["previous_level"])
+    _log_state = None
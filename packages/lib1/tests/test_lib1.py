@@ -1,4 +1,21 @@
-from lib1 import metadata, AgentConfig
+import gzip
+import io
+import json
+import logging
+
+from lib1 import (
+    metadata,
+    traceparent_from_event,
+    AgentConfig,
+    EventCapture,
+    LogSampler,
+    Tracer,
+    configure_logging,
+    flush_logging,
+    iter_captured_events,
+    redact_secrets,
+    shutdown_logging,
+)
 
 
 def test_metadata():
@@ -43,3 +60,245 @@ def test_agent_config_model_dump_env():
     assert env_vars["AGENTCORE_ENDPOINT"] == "http://localhost:8000"
     assert env_vars["AGENTCORE_API_KEY"] == "test-key"
 
+
+
+def test_agent_config_with_overrides():
+    """Test AgentConfig per-event overrides return validated copy."""
+    config = AgentConfig(agent_name="base-agent", agentcore_endpoint="http://base")
+    
+    tenant = config.with_overrides({"agent_name": "tenant-agent"})
+    assert tenant.agent_name == "tenant-agent"
+    assert tenant.agentcore_endpoint == "http://base"
+    assert config.agent_name == "base-agent"
+    
+    try:
+        config.with_overrides({"unknown_field": "x"})
+        assert False, "Should raise ValueError for unknown override"
+    except ValueError as e:
+        assert "unknown_field" in str(e)
+
+
+def test_agent_config_overrides_restricted_fields():
+    """Test limit/pool settings cannot be overridden per event."""
+    config = AgentConfig(agent_name="base-agent")
+    
+    for field, value in (("agent_pool_size", 1000), ("agentcore_rate_limit", 0)):
+        try:
+            config.with_overrides({field: value})
+            assert False, f"Should reject override of {field}"
+        except ValueError as e:
+            assert field in str(e)
+
+
+def test_agent_config_endpoint_override_drops_base_api_key():
+    """Test overriding endpoint never carries the deployment API key along."""
+    config = AgentConfig(
+        agent_name="base-agent",
+        agentcore_endpoint="http://base",
+        agentcore_api_key="base-key",
+    )
+    
+    tenant = config.with_overrides({"agentcore_endpoint": "http://tenant"})
+    assert tenant.agentcore_endpoint == "http://tenant"
+    assert tenant.agentcore_api_key is None
+    
+    keyed = config.with_overrides({"agentcore_endpoint": "http://tenant", "agentcore_api_key": "k"})
+    assert keyed.agentcore_api_key == "k"
+    assert config.with_overrides({"agent_name": "t"}).agentcore_api_key == "base-key"
+
+
+def test_redact_secrets():
+    """Test secret-looking keys and known secret values are masked."""
+    event = {"message": "key is s3cr3t", "config": {"agentcore_api_key": "abc"}, "n": 1}
+    redacted = redact_secrets(event, secrets=["s3cr3t"])
+    
+    assert redacted["message"] == "key is ***REDACTED***"
+    assert redacted["config"]["agentcore_api_key"] == "***REDACTED***"
+    assert redacted["n"] == 1
+    assert event["config"]["agentcore_api_key"] == "abc"
+
+
+def test_event_capture_roundtrip_and_rotation(tmp_path):
+    """Test captured events rotate across gzip files and read back in order."""
+    capture = EventCapture(directory=str(tmp_path), max_bytes=1, secrets=["s3cr3t"])
+    for i in range(3):
+        assert capture.record({"message": f"msg {i} s3cr3t"})
+    capture.close()
+    
+    assert len(list(tmp_path.glob("*.jsonl.gz"))) == 3
+    events = list(iter_captured_events(str(tmp_path)))
+    assert [e["message"] for e in events] == [f"msg {i} ***REDACTED***" for i in range(3)]
+
+
+def test_event_capture_readable_without_close(tmp_path):
+    """Test a capture whose writer was never closed, or was cut mid-write, reads back."""
+    capture = EventCapture(directory=str(tmp_path))
+    for i in range(3):
+        capture.record({"message": f"msg {i}"})
+    
+    assert [e["message"] for e in iter_captured_events(str(tmp_path))] == [
+        "msg 0", "msg 1", "msg 2"
+    ]
+    
+    # Simulate a writer killed part-way through a fourth record
+    capture_file = next(tmp_path.glob("*.jsonl.gz"))
+    partial = gzip.compress(b'{"ts": 0, "event": {"message": "msg 3"}}\n')[:12]
+    capture_file.write_bytes(capture_file.read_bytes() + partial)
+    assert [e["message"] for e in iter_captured_events(str(tmp_path))] == [
+        "msg 0", "msg 1", "msg 2"
+    ]
+
+
+def test_event_capture_invalid_env_disables_capture(monkeypatch):
+    """Test invalid capture settings disable capture instead of raising."""
+    monkeypatch.setenv("EVENT_CAPTURE_DIR", "/tmp/capture")
+    monkeypatch.setenv("EVENT_CAPTURE_SAMPLE_RATE", "abc")
+    
+    assert not EventCapture.from_env().enabled
+
+
+def test_event_capture_disabled():
+    """Test capture is a no-op without a directory or with zero sampling."""
+    assert not EventCapture().record({"message": "x"})
+    assert not EventCapture(directory="/nonexistent", sample_rate=0.0).record({"message": "x"})
+
+
+class _ListExporter:
+    def __init__(self):
+        self.spans = []
+    
+    def export(self, span):
+        self.spans.append(span)
+
+
+def test_tracer_sampled_spans_link_to_parent():
+    """Test sampled root and child spans are exported with parent links."""
+    exporter = _ListExporter()
+    tracer = Tracer(sample_rate=1.0, exporter=exporter)
+    
+    with tracer.trace("root"):
+        with tracer.span("child", k="v"):
+            header = tracer.current_traceparent()
+    
+    child, parent = exporter.spans
+    assert parent["name"] == "root" and parent["parent_id"] is None
+    assert child["parent_id"] == parent["span_id"]
+    assert child["trace_id"] == parent["trace_id"]
+    assert child["attributes"] == {"k": "v"}
+    assert header == f"00-{child['trace_id']}-{child['span_id']}-01"
+    assert tracer.current_traceparent() is None
+
+
+def test_tracer_unsampled_and_incoming_traceparent():
+    """Test unsampled traces export nothing and incoming traceparent is honored."""
+    exporter = _ListExporter()
+    tracer = Tracer(sample_rate=0.0, exporter=exporter)
+    
+    with tracer.trace("root"):
+        with tracer.span("child"):
+            assert tracer.current_traceparent() is None
+    assert exporter.spans == []
+    
+    incoming = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+    with tracer.trace("root", traceparent=incoming):
+        pass
+    assert exporter.spans[0]["trace_id"] == "a" * 32
+    assert exporter.spans[0]["parent_id"] == "b" * 16
+
+
+def test_tracer_forwards_unsampled_incoming_context():
+    """Test an unsampled incoming traceparent is forwarded with flags 00, nothing exported."""
+    exporter = _ListExporter()
+    tracer = Tracer(sample_rate=1.0, exporter=exporter)
+    
+    incoming = "00-" + "a" * 32 + "-" + "b" * 16 + "-00"
+    with tracer.trace("root", traceparent=incoming):
+        with tracer.span("child"):
+            assert tracer.current_traceparent() == incoming
+    assert tracer.current_traceparent() is None
+    assert exporter.spans == []
+
+
+def test_traceparent_from_event_ignores_malformed_events():
+    """Test malformed events yield no traceparent instead of raising."""
+    valid = "00-" + "a" * 32 + "-" + "b" * 16 + "-01"
+    
+    assert traceparent_from_event({"headers": {"traceparent": valid}}) == valid
+    assert traceparent_from_event({"traceparent": 123}) is None
+    assert traceparent_from_event({"headers": "abc"}) is None
+    assert traceparent_from_event({"headers": {"traceparent": [valid]}}) is None
+    assert traceparent_from_event(None) is None
+    with Tracer(sample_rate=0.0).trace("root", traceparent=123) as span:
+        assert span.traceparent is None
+
+
+def test_tracer_invalid_sample_rate_disables_tracing(monkeypatch):
+    """Test invalid TRACE_SAMPLE_RATE falls back to no sampling instead of raising."""
+    monkeypatch.setenv("TRACE_SAMPLE_RATE", "abc")
+    tracer = Tracer.from_env()
+    
+    assert tracer.sample_rate == 0.0
+    with tracer.trace("root") as span:
+        assert span.traceparent is None
+
+
+def test_async_logging_writes_json_after_flush():
+    """Test queued log records are written as compact JSON by flush_logging."""
+    stream = io.StringIO()
+    configure_logging(level="INFO", sample_rates={}, rate_limit=0, stream=stream)
+    try:
+        logging.getLogger("test.async").warning("send failed: %s", "boom")
+        assert flush_logging()
+        entry = json.loads(stream.getvalue().splitlines()[-1])
+        assert entry["level"] == "WARNING"
+        assert entry["logger"] == "test.async"
+        assert entry["msg"] == "send failed: boom"
+    finally:
+        shutdown_logging()
+
+
+def test_async_logging_snapshots_mutable_args():
+    """Test mutating a logged dict after the call does not change the log line."""
+    stream = io.StringIO()
+    configure_logging(level="INFO", sample_rates={}, rate_limit=0, stream=stream)
+    try:
+        payload = {"status": "before"}
+        logging.getLogger("test.async").warning("payload: %s", payload)
+        payload["status"] = "after"
+        flush_logging()
+        assert "before" in json.loads(stream.getvalue().splitlines()[-1])["msg"]
+    finally:
+        shutdown_logging()
+
+
+def test_configure_logging_invalid_env_falls_back(monkeypatch):
+    """Test invalid logging env settings fall back to defaults with a warning."""
+    monkeypatch.setenv("LOG_LEVEL", "LOUD")
+    monkeypatch.setenv("LOG_SAMPLE_RATES", "VERBOSE=0.1")
+    monkeypatch.setenv("LOG_RATE_LIMIT", "x")
+    stream = io.StringIO()
+    sampler = configure_logging(stream=stream)
+    try:
+        assert sampler.sample_rates == {}
+        assert sampler.rate_limit == 0.0
+        assert logging.getLogger().level == logging.INFO
+        flush_logging()
+        warnings = [json.loads(line)["msg"] for line in stream.getvalue().splitlines()]
+        assert any("LOG_SAMPLE_RATES" in w and "VERBOSE" in w for w in warnings)
+        assert len(warnings) == 3
+    finally:
+        shutdown_logging()
+
+
+def test_log_sampler_sampling_and_rate_limit():
+    """Test sampler drops sampled-out levels and records beyond the rate limit."""
+    sampler = LogSampler(sample_rates={logging.DEBUG: 0.0}, rate_limit=2)
+    debug = logging.LogRecord("t", logging.DEBUG, __file__, 0, "d", None, None)
+    warning = logging.LogRecord("t", logging.WARNING, __file__, 0, "w", None, None)
+    
+    assert not sampler.filter(debug)
+    kept = [sampler.filter(warning) for _ in range(5)]
+    assert kept[:2] == [True, True]
+    assert kept.count(True) == 2
+    assert sampler.take_dropped() == {"DEBUG": 1, "WARNING": 3}
+    assert sampler.take_dropped() == {}
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Replay captured Lambda events through an agent's lambda_handler.
+
+Streams events recorded by lib1.EventCapture (EVENT_CAPTURE_DIR) through the
+agent's lambda_handler across worker processes, either paced at a target
+rate or as fast as the concurrency limit allows, and reports throughput,
+error rates and latency histograms.
+
+Usage:
+    python replay_events.py agent-beta ./captures --rate 50 --concurrency 4
+    python replay_events.py agent-alpha ./captures --concurrency 8 --loop --duration 60
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+# Latency histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf")]
+
+_handler = None
+
+
+def _init_worker(source_dirs: List[str]) -> None:
+    """Import lambda_handler in a worker process."""
+    global _handler
+    # Never re-capture replayed traffic
+    os.environ.pop("EVENT_CAPTURE_DIR", None)
+    for source_dir in reversed(source_dirs):
+        sys.path.insert(0, source_dir)
+    _handler = importlib.import_module("lambda_handler").lambda_handler
+
+
+def _invoke(event: Dict[str, Any]) -> Tuple[int, float, Optional[str]]:
+    """Invoke lambda_handler once and return (status_code, latency_s, error)."""
+    start = time.perf_counter()
+    try:
+        result = _handler(event, None)
+        status = int(result.get("statusCode", 0))
+        error = None if status < 400 else result.get("body")
+    except Exception as e:
+        status, error = 0, f"{type(e).__name__}: {e}"
+    return status, time.perf_counter() - start, error
+
+
+def _noop(_: int) -> None:
+    """Worker warm-up task."""
+    return None
+
+
+class ReplayStats:
+    """Aggregate replay results into throughput, error and latency figures."""
+
+    def __init__(self):
+        """Initialize empty stats."""
+        self.latencies: List[float] = []
+        self.status_counts: Dict[str, int] = {}
+        self.errors = 0
+        self.sample_errors: List[str] = []
+        self.started = time.perf_counter()
+        self.finished = self.started
+
+    def add(self, status: int, latency: float, error: Optional[str]) -> None:
+        """Record one invocation result."""
+        self.latencies.append(latency)
+        key = str(status)
+        self.status_counts[key] = self.status_counts.get(key, 0) + 1
+        if error is not None:
+            self.errors += 1
+            if len(self.sample_errors) < 5:
+                self.sample_errors.append(error)
+        self.finished = time.perf_counter()
+
+    def percentile(self, pct: float) -> float:
+        """Return latency percentile in milliseconds."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index] * 1000
+
+    def histogram(self) -> Dict[str, int]:
+        """Return latency counts per bucket, keyed by upper bound in ms."""
+        counts = [0] * len(LATENCY_BUCKETS_MS)
+        for latency in self.latencies:
+            ms = latency * 1000
+            for i, bound in enumerate(LATENCY_BUCKETS_MS):
+                if ms <= bound:
+                    counts[i] += 1
+                    break
+        return {
+            ("+inf" if bound == float("inf") else f"<={bound}"): count
+            for bound, count in zip(LATENCY_BUCKETS_MS, counts)
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Return machine-readable summary."""
+        total = len(self.latencies)
+        elapsed = max(self.finished - self.started, 1e-9)
+        return {
+            "requests": total,
+            "errors": self.errors,
+            "error_rate": self.errors / total if total else 0.0,
+            "elapsed_s": elapsed,
+            "throughput_rps": total / elapsed,
+            "status_counts": self.status_counts,
+            "latency_ms": {
+                "p50": self.percentile(50),
+                "p90": self.percentile(90),
+                "p99": self.percentile(99),
+                "max": max(self.latencies, default=0.0) * 1000,
+            },
+            "histogram_ms": self.histogram(),
+            "sample_errors": self.sample_errors,
+        }
+
+
+def _print_summary(summary: Dict[str, Any]) -> None:
+    """Print human-readable replay summary."""
+    lat = summary["latency_ms"]
+    print(f"\n📊 Replayed {summary['requests']} events in {summary['elapsed_s']:.2f}s")
+    print(f"  throughput: {summary['throughput_rps']:.1f} req/s")
+    print(f"  errors:     {summary['errors']} ({summary['error_rate']:.2%})")
+    print(
+        f"  latency:    p50 {lat['p50']:.1f} ms  p90 {lat['p90']:.1f} ms  "
+        f"p99 {lat['p99']:.1f} ms  max {lat['max']:.1f} ms"
+    )
+    peak = max(summary["histogram_ms"].values(), default=0) or 1
+    for bucket, count in summary["histogram_ms"].items():
+        if count:
+            bar = "█" * max(1, int(40 * count / peak))
+            print(f"  {bucket:>8} ms {count:>8} {bar}")
+    for error in summary["sample_errors"]:
+        print(f"  ✗ {error}")
+
+
+def _event_stream(
+    capture_path: str, loop: bool, limit: Optional[int]
+) -> Iterator[Dict[str, Any]]:
+    """Yield captured events, optionally looping, up to limit events."""
+    from lib1 import iter_captured_events
+
+    sent = 0
+    while True:
+        produced = False
+        for event in iter_captured_events(capture_path):
+            if limit is not None and sent >= limit:
+                return
+            produced = True
+            sent += 1
+            yield event
+        if not loop or not produced:
+            return
+
+
+def replay(
+    source_dirs: List[str],
+    events: Iterator[Dict[str, Any]],
+    rate: float = 0.0,
+    concurrency: int = 1,
+    duration: Optional[float] = None,
+) -> ReplayStats:
+    """Replay events through lambda_handler in worker processes.
+
+    Args:
+        source_dirs: Directories to put on sys.path so lambda_handler imports.
+        events: Events to replay.
+        rate: Target events per second. 0 sends as fast as concurrency allows.
+        concurrency: Worker processes and maximum in-flight invocations.
+        duration: Optional wall-clock limit in seconds.
+
+    Returns:
+        Aggregated ReplayStats.
+    """
+    stats = ReplayStats()
+    pending: Set[Future] = set()
+    interval = 1.0 / rate if rate > 0 else 0.0
+
+    def _drain(block: bool) -> None:
+        nonlocal pending
+        if not pending:
+            return
+        done, pending = wait(
+            pending, timeout=None if block else 0, return_when=FIRST_COMPLETED
+        )
+        for future in done:
+            stats.add(*future.result())
+
+    with ProcessPoolExecutor(
+        max_workers=concurrency, initializer=_init_worker, initargs=(source_dirs,)
+    ) as pool:
+        # Warm up workers so cold starts do not skew the measurement
+        list(pool.map(_noop, range(concurrency)))
+        stats.started = time.perf_counter()
+        next_send = stats.started
+        for event in events:
+            now = time.perf_counter()
+            if duration is not None and now - stats.started >= duration:
+                break
+            if interval:
+                if next_send > now:
+                    time.sleep(next_send - now)
+                next_send += interval
+            while len(pending) >= concurrency:
+                _drain(block=True)
+            pending.add(pool.submit(_invoke, event))
+            _drain(block=False)
+        while pending:
+            _drain(block=True)
+
+    return stats
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Replay captured Lambda events through an agent's lambda_handler."
+    )
+    parser.add_argument("agent_name", help="agent-alpha or agent-beta")
+    parser.add_argument("captures", help="capture file or directory (EVENT_CAPTURE_DIR)")
+    parser.add_argument(
+        "--rate", type=float, default=0.0, help="target events/s (0 = unpaced)"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="worker processes / max in-flight"
+    )
+    parser.add_argument("--limit", type=int, help="stop after this many events")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument(
+        "--loop", action="store_true", help="repeat captured events until limit/duration"
+    )
+    parser.add_argument("--json", type=Path, help="write JSON summary to path")
+    args = parser.parse_args()
+
+    workspace_root = Path(__file__).parent
+    agent_src = workspace_root / "packages" / args.agent_name / "src"
+    if not agent_src.exists():
+        print(f"✗ Agent package not found: {agent_src}")
+        sys.exit(1)
+    if args.loop and args.limit is None and args.duration is None:
+        print("✗ --loop requires --limit or --duration")
+        sys.exit(1)
+
+    source_dirs = [str(agent_src), str(workspace_root / "packages" / "lib1" / "src")]
+    sys.path[:0] = source_dirs
+
+    print(
+        f"🔁 Replaying {args.captures} through {args.agent_name} "
+        f"(rate={args.rate or 'unpaced'}, concurrency={args.concurrency})"
+    )
+    stats = replay(
+        source_dirs,
+        _event_stream(args.captures, args.loop, args.limit),
+        rate=args.rate,
+        concurrency=max(1, args.concurrency),
+        duration=args.duration,
+    )
+    summary = stats.summary()
+    _print_summary(summary)
+    if args.json is not None:
+        args.json.write_text(json.dumps(summary, indent=2))
+        print(f"✓ Summary written: {args.json}")
+    sys.exit(1 if summary["requests"] == 0 else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from build_lambda import LambdaPackageBuilder
+
+
+def _builder(tmp_path, **kwargs):
+    return LambdaPackageBuilder(tmp_path, "agent-beta", "1.0.0", **kwargs)
+
+
+def test_classify_dev_file_keeps_runtime_code(tmp_path):
+    """Test runtime modules, top-level modules and licenses are never stripped."""
+    builder = _builder(tmp_path)
+
+    assert builder._classify_dev_file(Path("botocore/docs/docstring.py")) is None
+    assert builder._classify_dev_file(Path("boto3/docs/__init__.py")) is None
+    assert builder._classify_dev_file(Path("lambda_handler.py")) is None
+    assert builder._classify_dev_file(Path("README.md")) is None
+    assert builder._classify_dev_file(Path("pkg/LICENSE.md")) is None
+    assert builder._classify_dev_file(Path("pkg/docs/NOTICE.rst")) is None
+
+
+def test_classify_dev_file_strips_dev_files(tmp_path):
+    """Test test directories, docs, type stubs and C sources are classified."""
+    builder = _builder(tmp_path)
+
+    assert builder._classify_dev_file(Path("pkg/tests/test_core.py")) == "test"
+    assert builder._classify_dev_file(Path("pkg/docs/guide.rst")) == "doc"
+    assert builder._classify_dev_file(Path("pkg/README.md")) == "doc"
+    assert builder._classify_dev_file(Path("pkg/core.pyi")) == "type_stub"
+    assert builder._classify_dev_file(Path("pkg/_speedups.c")) == "dev"
+
+
+def test_build_size_report(tmp_path):
+    """Test size report breaks down bytes per top-level package."""
+    zip_path = tmp_path / "agent.zip"
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("lambda_handler.py", "x = 1\n")
+        zf.writestr("pkg/__init__.py", "a" * 1000)
+        zf.writestr("pkg/core.py", "b" * 1000)
+
+    stripped = {"test": {"files": 1, "bytes": 10}}
+    report = _builder(tmp_path)._build_size_report(zip_path, stripped)
+
+    assert list(report["packages"]) == ["pkg", "lambda_handler"]
+    assert report["packages"]["pkg"]["files"] == 2
+    assert report["packages"]["pkg"]["uncompressed"] == 2000
+    assert report["uncompressed_bytes"] == 2006
+    assert report["zip_bytes"] == zip_path.stat().st_size
+    assert report["stripped"] == stripped
+
+
+def test_enforce_budget(tmp_path):
+    """Test budget check passes within limits and raises when exceeded."""
+    report = {"zip_bytes": 2 * 1024 * 1024, "uncompressed_bytes": 10 * 1024 * 1024}
+
+    _builder(tmp_path, max_size_mb=5, max_unzipped_mb=20)._enforce_budget(report)
+    _builder(tmp_path, max_size_mb=None, max_unzipped_mb=None)._enforce_budget(report)
+
+    with pytest.raises(RuntimeError, match="zip 2.0 MB > budget 1.0 MB"):
+        _builder(tmp_path, max_size_mb=1)._enforce_budget(report)
+    with pytest.raises(RuntimeError, match="unzipped"):
+        _builder(tmp_path, max_unzipped_mb=5)._enforce_budget(report)
+
+
+def test_build_over_budget_removes_zip(tmp_path, monkeypatch):
+    """Test a failed budget check leaves no artifact on disk."""
+    def fake_install(self, staging):
+        (staging / "pkg").mkdir(exist_ok=True)
+        (staging / "pkg" / "__init__.py").write_bytes(b"x" * 4096)
+
+    monkeypatch.setattr(LambdaPackageBuilder, "_install_dependencies", fake_install)
+    monkeypatch.setattr(LambdaPackageBuilder, "_bundle_lib1", lambda self, staging: None)
+    builder = _builder(tmp_path, max_size_mb=None, max_unzipped_mb=0.001)
+
+    with pytest.raises(RuntimeError, match="Size budget exceeded"):
+        builder.build(output_dir=tmp_path)
+    assert not (tmp_path / "agent-beta-v1.0.0.zip").exists()
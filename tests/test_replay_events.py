@@ -0,0 +1,63 @@
+from lib1 import EventCapture
+
+from replay_events import ReplayStats, _event_stream
+
+
+def _stats(latencies_ms, errors=0):
+    stats = ReplayStats()
+    for i, ms in enumerate(latencies_ms):
+        stats.add(500 if i < errors else 200, ms / 1000, "boom" if i < errors else None)
+    return stats
+
+
+def test_percentile_index():
+    """Test percentile picks the nearest-rank sample from sorted latencies."""
+    stats = _stats([50, 10, 40, 20, 30])
+
+    assert stats.percentile(0) == 10
+    assert stats.percentile(50) == 30
+    assert stats.percentile(90) == 50
+    assert stats.percentile(100) == 50
+    assert ReplayStats().percentile(99) == 0.0
+
+
+def test_histogram_bucket_edges():
+    """Test latencies on a bucket bound land in that bucket, larger ones in the next."""
+    histogram = _stats([1, 1.5, 2, 5000, 6000]).histogram()
+
+    assert histogram["<=1"] == 1
+    assert histogram["<=2"] == 2
+    assert histogram["<=5000"] == 1
+    assert histogram["+inf"] == 1
+    assert sum(histogram.values()) == 5
+
+
+def test_summary_counts_errors():
+    """Test summary reports request, error and status counts."""
+    summary = _stats([10, 20, 30, 40], errors=1).summary()
+
+    assert summary["requests"] == 4
+    assert summary["errors"] == 1
+    assert summary["error_rate"] == 0.25
+    assert summary["status_counts"] == {"500": 1, "200": 3}
+    assert summary["sample_errors"] == ["boom"]
+    assert summary["latency_ms"]["max"] == 40
+
+
+def test_event_stream_loop_and_limit(tmp_path):
+    """Test looping replays captured events until the limit, and no loop stops once."""
+    capture = EventCapture(directory=str(tmp_path))
+    for i in range(3):
+        capture.record({"message": f"msg {i}"})
+    capture.close()
+
+    looped = [e["message"] for e in _event_stream(str(tmp_path), loop=True, limit=7)]
+    assert looped == ["msg 0", "msg 1", "msg 2"] * 2 + ["msg 0"]
+
+    once = list(_event_stream(str(tmp_path), loop=False, limit=None))
+    assert len(once) == 3
+
+
+def test_event_stream_loop_on_empty_capture_stops(tmp_path):
+    """Test looping over an empty capture directory terminates."""
+    assert list(_event_stream(str(tmp_path), loop=True, limit=None)) == []